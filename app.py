@@ -6,14 +6,40 @@ A Flask web application for managing music storage rules and monitoring operatio
 
 import os
 import csv
+import io
+import atexit
+import queue
+import re
 import json
 import logging
+import mmap
 import subprocess
 import secrets
-from datetime import datetime
+import selectors
+import shutil
+import tempfile
+import threading
+import time
+from collections import Counter, defaultdict, deque, namedtuple
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
-from logging.handlers import RotatingFileHandler
-from flask import Flask, render_template, request, jsonify, redirect, url_for, flash, g
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
+from flask import Flask, render_template, request, jsonify, redirect, url_for, flash, g, send_file
+from flask.json.provider import DefaultJSONProvider
+
+# Optional: orjson encodes the larger API payloads much faster than stdlib json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Optional: requests is only needed for webhook alerts
+try:
+    import requests
+except ImportError:
+    requests = None
 
 # Load environment variables from .env file if it exists
 try:
@@ -22,7 +48,38 @@ try:
 except ImportError:
     pass  # python-dotenv not installed, continue with system env vars only
 
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider that encodes and decodes with orjson.
+
+    Keys are sorted and datetimes formatted like Flask's default
+    provider. The compact separators and indent=2 that response() asks
+    for map onto orjson's own output; any other option (e.g. the
+    session serializer's object_hook) falls back to the stdlib json.
+    """
+    def dumps(self, obj, **kwargs):
+        extra = dict(kwargs)
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if extra.pop('sort_keys', True):
+            option |= orjson.OPT_SORT_KEYS
+        else:
+            return super().dumps(obj, **kwargs)
+        if extra.get('separators') == (',', ':'):
+            del extra['separators']
+        if extra.get('indent') == 2:
+            del extra['indent']
+            option |= orjson.OPT_INDENT_2
+        if extra:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=option).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
 app = Flask(__name__)
+if orjson is not None:
+    app.json = OrjsonProvider(app)
 
 # Security: Load secret key from environment or generate a temporary one
 app.secret_key = os.getenv('FLASK_SECRET_KEY')
@@ -37,19 +94,53 @@ if not app.secret_key:
 
 # Configuration
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+HOME = os.path.expanduser('~')
 RULES_FILE = os.path.join(BASE_DIR, 'music-storage-rules-unified.csv')
 LOG_FILE = os.getenv('MSM_LOG_FILE', os.path.join(BASE_DIR, 'music-storage-manager.log'))
+LOG_BACKUP_PREFIX = LOG_FILE + '.backup.'  # followed by a %Y%m%d_%H%M%S timestamp
 APP_LOG_FILE = os.getenv('MSM_APP_LOG_FILE', os.path.join(BASE_DIR, 'music-storage-manager-app.log'))
 SCRIPT_PATH = os.path.join(BASE_DIR, 'music-storage-manager.zsh')
 
+# Script environments, built once at startup (after .env is loaded) and
+# shared read-only between requests. None inherits the app's environment;
+# dry runs also skip NAS mounting.
+SCRIPT_ENV = None
+SCRIPT_ENV_DRY_RUN = {**os.environ, 'MSM_SKIP_NAS_MOUNT': '1'}
+
 # Storage paths (from environment or defaults matching shell script)
 SSD_ROOT = os.getenv('SSD_ROOT', '/Volumes/Instruments')
 NAS_ROOT = os.getenv('NAS_ROOT', '/Volumes/Music')
 
+# Maximum lines of script stdout/stderr kept per execution
+MAX_OUTPUT_LINES = 10000
+
+# Bytes kept from any single output line; the rest of an overlong line is dropped
+MAX_OUTPUT_LINE_BYTES = 4096
+
+# Scripts allowed to run at once; further /api/execute calls get a 429
+MAX_CONCURRENT_EXECUTIONS = int(os.getenv('MSM_MAX_CONCURRENT_EXECUTIONS', '4'))
+
+# Seconds a /health result is reused before the filesystem is probed again
+HEALTH_CACHE_SECONDS = 2.0
+
+# Operation metrics: recent operations kept in memory, and the size at
+# which the on-disk operations log is compacted back down to them
+METRICS_MAX_OPERATIONS = 100
+METRICS_MAX_BYTES = 1024 * 1024
+
 # Error alerting configuration
 ALERT_WEBHOOK_URL = os.getenv('ALERT_WEBHOOK_URL')
 ALERT_WEBHOOK_ENABLED = os.getenv('ALERT_WEBHOOK_ENABLED', 'false').lower() == 'true'
 
+# Alerts are posted from a background thread so request handlers never wait on the webhook
+_alert_queue = queue.Queue(maxsize=100)
+_alert_thread = None
+_alert_thread_lock = threading.Lock()
+
+# Monitors poll /health every few seconds; reuse a recent result briefly
+_health_cache = {'ts': 0.0, 'value': None, 'status': 200}
+_health_lock = threading.Lock()
+
 # Utility functions
 def sanitize_path_for_logging(path):
     """Sanitize paths in logs to avoid exposing sensitive information"""
@@ -57,64 +148,201 @@ def sanitize_path_for_logging(path):
         return path
 
     # Replace user home directory with ~
-    home = os.path.expanduser('~')
-    if path.startswith(home):
-        return path.replace(home, '~', 1)
+    if path.startswith(HOME):
+        return '~' + path[len(HOME):]
 
     return path
 
+def dumps_json(data):
+    """Serialize data to JSON bytes, with orjson when it is installed"""
+    if orjson is None:
+        return app.json.dumps(data).encode('utf-8')
+    return orjson.dumps(data)
+
+def json_response(body):
+    """Wrap already-serialized JSON bytes in a response"""
+    return app.response_class(body, mimetype='application/json')
+
+def conditional_json(etag, build):
+    """Answer 304 if the client already holds etag, else the JSON bytes from build()"""
+    if request.if_none_match.contains(etag):
+        response = app.response_class(status=304)
+    else:
+        response = json_response(build())
+    response.set_etag(etag)
+    # Let clients keep the body but revalidate on every poll
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+def _alert_worker():
+    """Deliver queued alerts over a single keep-alive session"""
+    session = requests.Session()
+    while True:
+        payload = _alert_queue.get()
+        try:
+            response = session.post(
+                ALERT_WEBHOOK_URL,
+                json=payload,
+                timeout=5
+            )
+
+            if response.status_code != 200:
+                app.logger.warning(f'Failed to send alert: HTTP {response.status_code}')
+
+        except Exception as e:
+            # Don't let alerting errors break the application
+            app.logger.debug(f'Error sending alert: {e}')
+
+def _start_alert_worker():
+    """Start the alert delivery thread on first use"""
+    global _alert_thread
+    with _alert_thread_lock:
+        if _alert_thread is None:
+            _alert_thread = threading.Thread(target=_alert_worker, name='alert-sender', daemon=True)
+            _alert_thread.start()
+
 def send_error_alert(error_type, message, details=None):
-    """Send error alert to configured webhook (Slack, Discord, etc.)"""
-    if not ALERT_WEBHOOK_ENABLED or not ALERT_WEBHOOK_URL:
+    """Queue an error alert for the configured webhook (Slack, Discord, etc.)"""
+    if not ALERT_WEBHOOK_ENABLED or not ALERT_WEBHOOK_URL or requests is None:
         return
 
-    try:
-        import requests
-
-        payload = {
-            'text': f'🚨 Music Storage Manager Alert: {error_type}',
-            'blocks': [
-                {
-                    'type': 'section',
-                    'text': {
-                        'type': 'mrkdwn',
-                        'text': f'*{error_type}*\n{message}'
-                    }
-                }
-            ]
-        }
-
-        if details:
-            payload['blocks'].append({
+    payload = {
+        'text': f'🚨 Music Storage Manager Alert: {error_type}',
+        'blocks': [
+            {
                 'type': 'section',
                 'text': {
                     'type': 'mrkdwn',
-                    'text': f'*Details:*\n```{details}```'
+                    'text': f'*{error_type}*\n{message}'
                 }
-            })
+            }
+        ]
+    }
 
+    if details:
         payload['blocks'].append({
-            'type': 'context',
-            'elements': [{
+            'type': 'section',
+            'text': {
                 'type': 'mrkdwn',
-                'text': f'Timestamp: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}'
-            }]
+                'text': f'*Details:*\n```{details}```'
+            }
         })
 
-        response = requests.post(
-            ALERT_WEBHOOK_URL,
-            json=payload,
-            timeout=5
-        )
+    payload['blocks'].append({
+        'type': 'context',
+        'elements': [{
+            'type': 'mrkdwn',
+            'text': f'Timestamp: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}'
+        }]
+    })
+
+    _start_alert_worker()
+    try:
+        _alert_queue.put_nowait(payload)
+    except queue.Full:
+        app.logger.debug(f'Alert queue full, dropping alert: {error_type}')
+
+_execution_slots = threading.BoundedSemaphore(MAX_CONCURRENT_EXECUTIONS)
+
+# Result of `SCRIPT_PATH --help`, reused until the script file changes
+_help_cache = {'key': None, 'result': None}
+_help_lock = threading.Lock()
+
+def refresh_script_state():
+    """Re-check whether SCRIPT_PATH exists and is executable, and cache the result"""
+    global script_state
+    exists = os.path.isfile(SCRIPT_PATH)
+    script_state = {'exists': exists, 'executable': exists and os.access(SCRIPT_PATH, os.X_OK)}
+    return script_state
+
+# The script rarely changes, so execute/test reuse this instead of checking per request.
+# Negative results are always re-checked; POST /api/refresh-script-state picks up
+# a script that has since been removed or lost its execute bit.
+script_state = refresh_script_state()
+
+def run_script(cmd, timeout, env):
+    """Run a command, keeping only the last MAX_OUTPUT_LINES of stdout/stderr.
+
+    Each line is cut to MAX_OUTPUT_LINE_BYTES, so output without newlines
+    cannot grow without bound either.
+
+    Returns a subprocess.CompletedProcess. Kills the process and raises
+    subprocess.TimeoutExpired if it runs longer than timeout seconds.
+    """
+    deadline = time.monotonic() + timeout
+    output = {}
+
+    with subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                          cwd=BASE_DIR, env=env) as proc:
+        with selectors.DefaultSelector() as selector:
+            for name, pipe in (('stdout', proc.stdout), ('stderr', proc.stderr)):
+                output[name] = {'lines': deque(maxlen=MAX_OUTPUT_LINES), 'partial': b'', 'count': 0, 'clipped': 0}
+                selector.register(pipe, selectors.EVENT_READ, output[name])
+
+            while selector.get_map():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    proc.kill()
+                    raise subprocess.TimeoutExpired(cmd, timeout)
+
+                for key, _ in selector.select(remaining):
+                    chunk = os.read(key.fd, 65536)
+                    if not chunk:
+                        selector.unregister(key.fileobj)
+                        continue
 
-        if response.status_code != 200:
-            app.logger.warning(f'Failed to send alert: HTTP {response.status_code}')
+                    stream = key.data
+                    lines = (stream['partial'] + chunk).split(b'\n')
+                    partial = lines.pop()
+                    if len(partial) > MAX_OUTPUT_LINE_BYTES:
+                        stream['clipped'] += len(partial) - MAX_OUTPUT_LINE_BYTES
+                        partial = partial[:MAX_OUTPUT_LINE_BYTES]
+                    stream['partial'] = partial
+                    for i, line in enumerate(lines):
+                        if len(line) > MAX_OUTPUT_LINE_BYTES:
+                            stream['clipped'] += len(line) - MAX_OUTPUT_LINE_BYTES
+                            lines[i] = line[:MAX_OUTPUT_LINE_BYTES]
+                    stream['lines'].extend(lines)
+                    stream['count'] += len(lines)
 
-    except Exception as e:
-        # Don't let alerting errors break the application
-        app.logger.debug(f'Error sending alert: {e}')
+        try:
+            returncode = proc.wait(timeout=max(deadline - time.monotonic(), 0))
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            raise
+
+    def collect(stream):
+        text = b''.join(line + b'\n' for line in stream['lines']) + stream['partial']
+        text = text.decode('utf-8', errors='replace')
+        dropped = stream['count'] - len(stream['lines'])
+        if dropped:
+            text = f'[... {dropped} earlier lines omitted ...]\n' + text
+        if stream['clipped']:
+            text = f'[... {stream["clipped"]} bytes of overlong lines omitted ...]\n' + text
+        return text
+
+    return subprocess.CompletedProcess(cmd, returncode, collect(output['stdout']), collect(output['stderr']))
 
 # Configure logging
+class SampledRotatingFileHandler(RotatingFileHandler):
+    """RotatingFileHandler that only checks the file size every N records.
+
+    The stock handler stats and seeks the log on every emit; sampling lets
+    the file overshoot maxBytes by at most N-1 records.
+    """
+    check_every = 128
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._emits = 0
+
+    def shouldRollover(self, record):
+        self._emits += 1
+        if self._emits < self.check_every:
+            return False
+        self._emits = 0
+        return super().shouldRollover(record)
+
 def setup_logging():
     """Configure application logging with file and console handlers"""
     # Create formatters
@@ -127,7 +355,7 @@ def setup_logging():
     )
 
     # File handler with rotation (10MB max, keep 5 backups)
-    file_handler = RotatingFileHandler(
+    file_handler = SampledRotatingFileHandler(
         APP_LOG_FILE,
         maxBytes=10 * 1024 * 1024,  # 10MB
         backupCount=5
@@ -140,16 +368,23 @@ def setup_logging():
     console_handler.setLevel(logging.INFO)
     console_handler.setFormatter(console_formatter)
 
+    # File writes happen on a background listener thread so requests
+    # only pay for a queue put, not disk I/O
+    log_queue = queue.Queue(-1)
+    queue_handler = QueueHandler(log_queue)
+    listener = QueueListener(log_queue, file_handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+
     # Configure root logger
     root_logger = logging.getLogger()
     root_logger.setLevel(logging.DEBUG)
-    root_logger.addHandler(file_handler)
+    root_logger.addHandler(queue_handler)
     root_logger.addHandler(console_handler)
 
-    # Configure Flask logger
+    # Configure Flask logger; records propagate to the root handlers above,
+    # so attaching them here too would emit every line twice
     app.logger.setLevel(logging.DEBUG)
-    app.logger.addHandler(file_handler)
-    app.logger.addHandler(console_handler)
 
     # Reduce noise from werkzeug
     logging.getLogger('werkzeug').setLevel(logging.WARNING)
@@ -163,23 +398,26 @@ setup_logging()
 @app.before_request
 def log_request_info():
     """Log incoming request details"""
-    g.start_time = datetime.now()
-    app.logger.debug(f'Request: {request.method} {request.path}')
+    g.start_time = time.perf_counter()
+    if not app.logger.isEnabledFor(logging.DEBUG):
+        return
+
+    app.logger.debug('Request: %s %s', request.method, request.path)
     if request.method in ['POST', 'PUT', 'PATCH']:
         # Log request body for non-GET requests (but sanitize sensitive data)
         if request.is_json:
-            app.logger.debug(f'Request JSON: {request.get_json()}')
+            app.logger.debug('Request JSON: %s', request.get_json(silent=True))
         elif request.form:
-            app.logger.debug(f'Request Form: {dict(request.form)}')
+            app.logger.debug('Request Form: %s', dict(request.form))
 
 @app.after_request
 def log_response_info(response):
     """Log response details and request duration"""
     if hasattr(g, 'start_time'):
-        duration = (datetime.now() - g.start_time).total_seconds()
+        duration = time.perf_counter() - g.start_time
         app.logger.info(
-            f'{request.method} {request.path} - {response.status_code} '
-            f'({duration:.3f}s)'
+            '%s %s - %s (%.3fs)',
+            request.method, request.path, response.status_code, duration
         )
     return response
 
@@ -198,40 +436,134 @@ def handle_exception(e):
 
     return jsonify({'status': 'error', 'message': 'Internal server error'}), 500
 
+# Rule categories as (source substring, category) pairs, checked in order
+_CATEGORY_RULES = (
+    ('native instruments', 'Native Instruments'),
+    ('uvi', 'UVI Products'),
+    ('arturia', 'Arturia'),
+    ('logic', 'Logic Pro'),
+    ('samples', 'Sample Libraries'),
+    ('projects', 'Projects'),
+    ('music', 'Projects'),
+    ('/library/application support', 'System Content'),
+    ('library/application support', 'User Settings'),
+    ('documents', 'User Settings'),
+)
+
+# Optional: pyahocorasick finds every category needle in a single pass
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None  # fall back to scanning _CATEGORY_RULES in order
+
+def _build_category_automaton():
+    """Compile _CATEGORY_RULES into an Aho-Corasick automaton if available"""
+    if ahocorasick is None:
+        return None
+
+    automaton = ahocorasick.Automaton()
+    for priority, (needle, category) in enumerate(_CATEGORY_RULES):
+        automaton.add_word(needle, (priority, category))
+    automaton.make_automaton()
+    return automaton
+
+_CATEGORY_AUTOMATON = _build_category_automaton()
+
+@lru_cache(maxsize=1024)
+def _categorize_source(source):
+    """Map a lowercased source path to its category (memoised across saves)"""
+    if _CATEGORY_AUTOMATON is not None:
+        # Lowest priority index wins, matching the table order
+        match = min((value for _, value in _CATEGORY_AUTOMATON.iter(source)), default=None)
+        return match[1] if match else 'Other'
+
+    for needle, category in _CATEGORY_RULES:
+        if needle in source:
+            return category
+    return 'Other'
+
+# Parsed rules plus the same rules bucketed by target (SSD/NAS/Local)
+RulesView = namedtuple('RulesView', ['rules', 'by_target'])
+
 class RulesManager:
     def __init__(self, rules_file):
         self.rules_file = rules_file
+        # Parsed rules are cached until the file's mtime/size changes
+        self._cache = None
+        self._cache_key = None
+        self._json = None  # (rules, serialized rules) for the cached rules
+        self._view = None  # RulesView for the cached rules
+        self._lock = threading.Lock()
 
     def load_rules(self):
-        """Load rules from CSV file"""
-        rules = []
-        if not os.path.exists(self.rules_file):
+        """Load rules from CSV file as a tuple (cached until the file changes)"""
+        try:
+            st = os.stat(self.rules_file)
+        except FileNotFoundError:
             app.logger.warning(f'Rules file not found: {self.rules_file}')
+            return ()
+
+        key = (st.st_mtime_ns, st.st_size)
+        with self._lock:
+            if key == self._cache_key:
+                return self._cache
+
+            # Shared between requests, so hand out an immutable sequence
+            rules = tuple(self._parse_rules())
+            self._cache, self._cache_key = rules, key
             return rules
 
+    def load_rules_view(self):
+        """Load rules together with the rules grouped by target, built once per version of the file"""
+        rules = self.load_rules()
+        with self._lock:
+            if self._view is None or self._view.rules is not rules:
+                by_target = {'SSD': [], 'NAS': [], 'Local': []}
+                for rule in rules:
+                    bucket = by_target.get(rule['target'].upper())
+                    if bucket is not None:
+                        bucket.append(rule)
+                self._view = RulesView(rules, {t: tuple(b) for t, b in by_target.items()})
+            return self._view
+
+    def load_rules_json(self):
+        """Load rules as JSON bytes, serialized once per version of the file"""
+        rules = self.load_rules()
+        with self._lock:
+            if self._json is None or self._json[0] is not rules:
+                self._json = (rules, dumps_json(rules))
+            return self._json[1]
+
+    def _parse_rules(self):
+        """Parse rules from CSV file"""
+        rules = []
         try:
-            with open(self.rules_file, 'r') as f:
-                reader = csv.reader(f, delimiter='|')
-                for i, row in enumerate(reader, 1):
-                    if not row or row[0].strip().startswith('#') or not row[0].strip():
-                        continue
-
-                    if len(row) >= 4:
-                        rules.append({
-                            'line': i,
-                            'source': row[0].strip(),
-                            'target': row[1].strip(),
-                            'subpath': row[2].strip(),
-                            'mode': row[3].strip()
-                        })
-                    elif len(row) >= 3:
-                        rules.append({
-                            'line': i,
-                            'source': row[0].strip(),
-                            'target': row[1].strip(),
-                            'subpath': row[2].strip(),
-                            'mode': 'move'
-                        })
+            # newline='' so only '\n' ends a line, as it does for the shell's `read`
+            with open(self.rules_file, 'r', newline='') as f:
+                text = f.read()
+
+            # Split like the shell script's `IFS='|' read -r src target subpath mode`:
+            # no quoting, the last field keeps any remainder, and rows whose trimmed
+            # source is empty or a comment are skipped. Trimming also drops a CRLF '\r'.
+            strip = str.strip
+            append = rules.append
+            for i, line in enumerate(text.split('\n'), 1):
+                row = line.split('|', 3)
+                source = strip(row[0])
+                if not source or source[0] == '#':
+                    continue
+
+                n = len(row)
+                if n < 3:
+                    continue
+
+                append({
+                    'line': i,
+                    'source': source,
+                    'target': strip(row[1]),
+                    'subpath': strip(row[2]),
+                    'mode': strip(row[3]) if n >= 4 else 'move'
+                })
             app.logger.debug(f'Loaded {len(rules)} rules from {self.rules_file}')
         except Exception as e:
             app.logger.error(f'Error loading rules: {e}', exc_info=True)
@@ -241,68 +573,107 @@ class RulesManager:
     def save_rules(self, rules):
         """Save rules to CSV file"""
         try:
-            # Read original file to preserve comments
-            original_lines = []
-            if os.path.exists(self.rules_file):
-                with open(self.rules_file, 'r') as f:
-                    original_lines = f.readlines()
-
-            # Create backup
-            backup_file = f"{self.rules_file}.backup.{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-            if original_lines:
-                with open(backup_file, 'w') as f:
-                    f.writelines(original_lines)
-                app.logger.info(f'Created rules backup: {backup_file}')
-
-            # Write new rules file
-            with open(self.rules_file, 'w') as f:
-                # Write header
-                f.write("# Unified Music Storage Rules\n")
-                f.write("# SOURCE_PATH|TARGET|DEST_SUBPATH|MODE\n")
-                f.write("# TARGET: SSD, NAS, or Local\n")
-                f.write("# MODE: move (migrate+symlink), copy (backup only)\n\n")
-
-                # Group rules by category
-                categories = {}
-                for rule in rules:
-                    category = self._categorize_rule(rule)
-                    if category not in categories:
-                        categories[category] = []
-                    categories[category].append(rule)
-
-                # Write rules by category
-                for category, category_rules in categories.items():
-                    f.write(f"# {category}\n")
-                    for rule in category_rules:
-                        f.write(f"{rule['source']}|{rule['target']}|{rule['subpath']}|{rule['mode']}\n")
-                    f.write("\n")
+            # Group rules by category
+            categories = defaultdict(list)
+            categorize = self._categorize_rule
+            sources_lc = [rule['source'].lower() for rule in rules]
+            for rule, source_lc in zip(rules, sources_lc):
+                categories[categorize(source_lc)].append(rule)
+
+            # Build the new file contents, header first
+            buf = io.StringIO()
+            buf.write(
+                "# Unified Music Storage Rules\n"
+                "# SOURCE_PATH|TARGET|DEST_SUBPATH|MODE\n"
+                "# TARGET: SSD, NAS, or Local\n"
+                "# MODE: move (migrate+symlink), copy (backup only)\n\n"
+            )
+            # The shell script splits on a bare '|', so fields are written
+            # unquoted; a '|' inside a field raises instead of corrupting the file
+            writer = csv.writer(buf, delimiter='|', quoting=csv.QUOTE_NONE,
+                                quotechar=None, lineterminator='\n')
+            for category, category_rules in categories.items():
+                buf.write(f"# {category}\n")
+                writer.writerows(
+                    (rule['source'], rule['target'], rule['subpath'], rule['mode'])
+                    for rule in category_rules
+                )
+                buf.write("\n")
+
+            # Write new rules file atomically so a crash can't leave it truncated
+            fd, tmp_path = tempfile.mkstemp(
+                prefix='.rules-', dir=os.path.dirname(self.rules_file) or '.'
+            )
+            try:
+                with os.fdopen(fd, 'w') as f:
+                    f.write(buf.getvalue())
+                    f.flush()
+                    os.fsync(f.fileno())
+
+                if os.path.exists(self.rules_file):
+                    # mkstemp creates the file 0600; keep the rules file's permissions
+                    shutil.copymode(self.rules_file, tmp_path)
+
+                    # Create backup. The old file is replaced below, never rewritten,
+                    # so a hard link to it is a stable snapshot
+                    backup_file = f"{self.rules_file}.backup.{time.strftime('%Y%m%d_%H%M%S')}"
+                    try:
+                        os.link(self.rules_file, backup_file)
+                    except OSError:
+                        shutil.copyfile(self.rules_file, backup_file)
+                    app.logger.info(f'Created rules backup: {backup_file}')
+                else:
+                    os.chmod(tmp_path, 0o644)
+                os.replace(tmp_path, self.rules_file)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+            finally:
+                # Don't trust mtime alone: a same-size rewrite can land in the same tick
+                with self._lock:
+                    self._cache = self._cache_key = None
 
             app.logger.info(f'Saved {len(rules)} rules to {self.rules_file}')
         except Exception as e:
             app.logger.error(f'Error saving rules: {e}', exc_info=True)
             raise
 
-    def _categorize_rule(self, rule):
-        """Categorize a rule based on its source path"""
-        source = rule['source'].lower()
-        if 'native instruments' in source:
-            return 'Native Instruments'
-        elif 'uvi' in source:
-            return 'UVI Products'
-        elif 'arturia' in source:
-            return 'Arturia'
-        elif 'logic' in source:
-            return 'Logic Pro'
-        elif 'samples' in source:
-            return 'Sample Libraries'
-        elif 'projects' in source or 'music' in source:
-            return 'Projects'
-        elif '/library/application support' in source:
-            return 'System Content'
-        elif 'library/application support' in source or 'documents' in source:
-            return 'User Settings'
-        else:
-            return 'Other'
+    def _categorize_rule(self, source):
+        """Categorize a rule based on its lowercased source path"""
+        return _categorize_source(source)
+
+# Matches the log level markers counted by LogMonitor stats
+_LEVEL_RE = re.compile(rb'ERROR|WARN')
+
+# Bytes of a mapped log copied at a time when counting lines
+_SCAN_WINDOW = 1 << 20
+
+def _count_log_levels(buf, start, end):
+    """Count (error lines, warning lines) in buf[start:end].
+
+    Only regex matches are visited, so the scan stays in C. A line counts
+    once, and ERROR wins over WARN wherever they appear in the line.
+    """
+    errors = warnings = 0
+    line_end = start - 1
+    level = None
+
+    for m in _LEVEL_RE.finditer(buf, start, end):
+        if m.start() > line_end:
+            line_end = buf.find(b'\n', m.end(), end)
+            if line_end == -1:
+                line_end = end
+            level = m.group()
+            if level == b'ERROR':
+                errors += 1
+            else:
+                warnings += 1
+        elif level == b'WARN' and m.group() == b'ERROR':
+            level = b'ERROR'
+            warnings -= 1
+            errors += 1
+
+    return errors, warnings
 
 class LogMonitor:
     def __init__(self, log_file):
@@ -313,6 +684,82 @@ class LogMonitor:
             'app': APP_LOG_FILE,
             'simple-app': os.path.join(BASE_DIR, 'music-storage-manager-simple-app.log')
         }
+        # Per-file stats state so unchanged logs aren't rescanned from byte 0
+        self._stats_cache = {}
+        self._stats_lock = threading.Lock()
+
+    def read_tail_and_stats(self, lines=50, log_source='script'):
+        """Get recent log entries and log statistics for specified log source"""
+        log_file = self.log_files.get(log_source, self.log_file)
+
+        if not os.path.exists(log_file):
+            app.logger.debug(f'Log file not found: {log_file}')
+            return [], {'total_lines': 0, 'errors': 0, 'warnings': 0}
+
+        try:
+            return self._tail(log_file, lines), self._scan_stats(log_file)
+        except Exception as e:
+            app.logger.error(f'Error reading log file: {e}', exc_info=True)
+            return [], {'total_lines': 0, 'errors': 0, 'warnings': 0}
+
+    def etag(self, log_source='script'):
+        """ETag for a log source, derived from its file's identity, mtime and size"""
+        log_file = self.log_files.get(log_source, self.log_file)
+        try:
+            st = os.stat(log_file)
+        except FileNotFoundError:
+            return 'missing'
+        return f'{st.st_ino:x}-{st.st_mtime_ns:x}-{st.st_size:x}'
+
+    def reset_stats(self, path):
+        """Drop cached stats for a log file so the next read rescans it"""
+        with self._stats_lock:
+            self._stats_cache.pop(path, None)
+
+    def _scan_stats(self, path):
+        """Count lines, errors and warnings, scanning only bytes appended since the last call"""
+        st = os.stat(path)
+        ident = (st.st_dev, st.st_ino)
+
+        with self._stats_lock:
+            state = self._stats_cache.get(path)
+            # Rotated (new inode) or truncated files are rescanned from the start
+            if state is None or state['ident'] != ident or st.st_size < state['offset']:
+                state = {'ident': ident, 'offset': 0, 'total_lines': 0, 'errors': 0, 'warnings': 0}
+                self._stats_cache[path] = state
+
+            stats = {'total_lines': state['total_lines'], 'errors': state['errors'], 'warnings': state['warnings']}
+            if st.st_size == state['offset']:
+                return stats
+
+            offset = state['offset']
+            with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                end = len(mm)
+                if hasattr(mmap, 'MADV_SEQUENTIAL'):
+                    # Read-ahead aggressively; madvise needs a page-aligned start
+                    start = offset - offset % mmap.PAGESIZE
+                    mm.madvise(mmap.MADV_SEQUENTIAL, start, end - start)
+                # Only commit complete lines; a partial last line is rescanned next time
+                committed = mm.rfind(b'\n', offset, end) + 1 or offset
+
+                errors, warnings = _count_log_levels(mm, offset, committed)
+                # mmap has no count(); count newlines over bounded slices
+                state['total_lines'] += sum(
+                    mm[pos:min(pos + _SCAN_WINDOW, committed)].count(b'\n')
+                    for pos in range(offset, committed, _SCAN_WINDOW)
+                )
+                state['errors'] += errors
+                state['warnings'] += warnings
+                state['offset'] = committed
+
+                stats = {'total_lines': state['total_lines'], 'errors': state['errors'], 'warnings': state['warnings']}
+                if committed < end:
+                    errors, warnings = _count_log_levels(mm, committed, end)
+                    stats['total_lines'] += 1
+                    stats['errors'] += errors
+                    stats['warnings'] += warnings
+
+            return stats
 
     def get_recent_logs(self, lines=50, log_source='script'):
         """Get recent log entries from specified log source"""
@@ -323,62 +770,74 @@ class LogMonitor:
             return []
 
         try:
-            with open(log_file, 'r') as f:
-                all_lines = f.readlines()
-                return [line.strip() for line in all_lines[-lines:]]
+            return self._tail(log_file, lines)
         except Exception as e:
             app.logger.error(f'Error reading log file: {e}', exc_info=True)
             return []
 
-    def get_log_stats(self, log_source='script'):
-        """Get log statistics for specified log source"""
-        log_file = self.log_files.get(log_source, self.log_file)
+    @staticmethod
+    def _tail(path, lines, block_size=8192):
+        """Read the last lines of a file by seeking backwards from the end"""
+        if lines <= 0:
+            return []
 
-        if not os.path.exists(log_file):
-            app.logger.debug(f'Log file not found for stats: {log_file}')
-            return {'total_lines': 0, 'errors': 0, 'warnings': 0}
+        with open(path, 'rb') as f:
+            pos = f.seek(0, os.SEEK_END)
+            blocks = []
+            newlines = 0
+            # One extra newline is needed to know the first line is complete
+            while pos > 0 and newlines <= lines:
+                step = min(block_size, pos)
+                pos -= step
+                f.seek(pos)
+                block = f.read(step)
+                blocks.append(block)
+                newlines += block.count(b'\n')
+
+        tail = b''.join(reversed(blocks)).splitlines()[-lines:]
+        return [line.decode('utf-8', errors='replace').strip() for line in tail]
 
-        total_lines = 0
-        errors = 0
-        warnings = 0
+    def get_log_stats(self, log_source='script'):
+        """Get log statistics for specified log source"""
+        return self.read_tail_and_stats(0, log_source)[1]
 
+    @staticmethod
+    def _list_backups(path, marker='.'):
+        """List backup files ("<log><marker>*") next to a log file in one directory scan"""
+        log_dir, base = os.path.split(path)
+        prefix = base + marker
         try:
-            with open(log_file, 'r') as f:
-                for line in f:
-                    total_lines += 1
-                    if 'ERROR' in line:
-                        errors += 1
-                    elif 'WARN' in line:
-                        warnings += 1
-        except Exception as e:
-            app.logger.error(f'Error getting log stats: {e}', exc_info=True)
-
-        return {'total_lines': total_lines, 'errors': errors, 'warnings': warnings}
+            with os.scandir(log_dir or '.') as it:
+                return [e for e in it if e.name.startswith(prefix)]
+        except FileNotFoundError:
+            return []
 
     def get_available_logs(self):
         """Get list of available log files with metadata"""
-        import glob
         logs = []
 
         for name, path in self.log_files.items():
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                st = None
+
             log_info = {
                 'name': name,
                 'path': path,
-                'exists': os.path.exists(path),
+                'exists': st is not None,
                 'size': 0,
                 'size_human': '0 B',
                 'backups': 0
             }
 
-            if os.path.exists(path):
-                size = os.path.getsize(path)
+            if st is not None:
+                size = st.st_size
                 log_info['size'] = size
                 log_info['size_human'] = self._format_size(size)
 
                 # Count backup files
-                backup_pattern = f"{path}.*"
-                backups = glob.glob(backup_pattern)
-                log_info['backups'] = len(backups)
+                log_info['backups'] = len(self._list_backups(path))
 
             logs.append(log_info)
 
@@ -386,22 +845,19 @@ class LogMonitor:
 
     def get_rotation_status(self):
         """Get rotation status for all log files"""
-        import glob
-
         rotation_info = []
 
         for name, path in self.log_files.items():
-            if not os.path.exists(path):
+            try:
+                size = os.stat(path).st_size
+            except FileNotFoundError:
                 continue
 
-            size = os.path.getsize(path)
             max_size = 10 * 1024 * 1024  # 10MB
             percentage = (size / max_size) * 100
 
-            # Count backups
-            backup_pattern = f"{path}.*"
-            backups = glob.glob(backup_pattern)
-            backup_files = sorted(backups, key=lambda x: os.path.getmtime(x), reverse=True)
+            # Count backups (DirEntry caches its stat, so sorting is free)
+            backup_files = sorted(self._list_backups(path), key=lambda e: e.stat().st_mtime, reverse=True)
 
             rotation_info.append({
                 'name': name,
@@ -415,9 +871,9 @@ class LogMonitor:
                 'max_backups': 5,
                 'backup_files': [
                     {
-                        'path': sanitize_path_for_logging(bf),
-                        'size': self._format_size(os.path.getsize(bf)),
-                        'modified': datetime.fromtimestamp(os.path.getmtime(bf)).isoformat()
+                        'path': sanitize_path_for_logging(bf.path),
+                        'size': self._format_size(bf.stat().st_size),
+                        'modified': datetime.fromtimestamp(bf.stat().st_mtime).isoformat()
                     }
                     for bf in backup_files[:5]  # Show only latest 5
                 ]
@@ -438,47 +894,153 @@ class OperationMetrics:
     """Track operation metrics and statistics"""
 
     def __init__(self):
-        self.metrics_file = os.path.join(BASE_DIR, 'metrics.json')
-        self._ensure_metrics_file()
-
-    def _ensure_metrics_file(self):
-        """Create metrics file if it doesn't exist"""
-        if not os.path.exists(self.metrics_file):
-            self._save_metrics({
-                'operations': [],
-                'summary': {
-                    'total': 0,
-                    'success': 0,
-                    'failed': 0,
-                    'timeouts': 0
-                }
-            })
+        # Operations are appended to a JSONL log; totals live in a small summary file
+        self.operations_file = os.path.join(BASE_DIR, 'metrics.jsonl')
+        self.summary_file = os.path.join(BASE_DIR, 'metrics-summary.json')
+        self.legacy_metrics_file = os.path.join(BASE_DIR, 'metrics.json')
+        self._lock = threading.Lock()
+        self._ops = deque(maxlen=METRICS_MAX_OPERATIONS)  # newest first
+        self._summary = {'total': 0, 'success': 0, 'failed': 0, 'timeouts': 0}
+        # Dashboard aggregates over self._ops, updated as operations enter and leave
+        self._by_day = {}  # date -> [total, success]
+        self._duration_sum = 0.0
+        self._duration_count = 0
+        self._error_codes = Counter()
+        self._fh = None
+        # Bumped on every recorded operation; the boot token keeps ETags
+        # from one process from matching another's
+        self._boot = secrets.token_hex(4)
+        self._version = 0
+        self._load_metrics()
 
     def _load_metrics(self):
-        """Load metrics from file"""
+        """Load recent operations and summary from disk"""
+        try:
+            if not os.path.exists(self.operations_file) and os.path.exists(self.legacy_metrics_file):
+                self._migrate_legacy_metrics()
+        except Exception as e:
+            app.logger.error(f'Error migrating metrics: {e}', exc_info=True)
+
+        try:
+            if os.path.exists(self.operations_file):
+                line = ''
+                with open(self.operations_file, 'r') as f:
+                    for i, line in enumerate(f, 1):
+                        if not line.strip():
+                            continue
+                        try:
+                            self._push_operation(json.loads(line))
+                        except (ValueError, KeyError, TypeError) as e:
+                            app.logger.warning(f'Skipping bad metrics line {i}: {e}')
+
+                # A crash mid-append can leave a torn last line; end it so the
+                # next operation is written on a line of its own
+                if line and not line.endswith('\n'):
+                    with open(self.operations_file, 'a') as f:
+                        f.write('\n')
+        except Exception as e:
+            app.logger.error(f'Error loading operations: {e}', exc_info=True)
+
         try:
-            if os.path.exists(self.metrics_file):
-                with open(self.metrics_file, 'r') as f:
-                    return json.load(f)
+            if os.path.exists(self.summary_file):
+                with open(self.summary_file, 'r') as f:
+                    self._summary.update(json.load(f))
         except Exception as e:
-            app.logger.error(f'Error loading metrics: {e}', exc_info=True)
+            app.logger.error(f'Error loading metrics summary: {e}', exc_info=True)
+
+    def _migrate_legacy_metrics(self):
+        """Seed the JSONL log and summary from an old metrics.json"""
+        with open(self.legacy_metrics_file, 'r') as f:
+            legacy = json.load(f)
+
+        self._write_operations(reversed(legacy.get('operations', [])))
+        self._summary.update(legacy.get('summary', {}))
+        self._save_summary()
+        app.logger.info(f'Migrated metrics from {self.legacy_metrics_file}')
+
+    def _write_operations(self, operations):
+        """Atomically replace the operations log with the given operations (oldest first)"""
+        fd, tmp_path = tempfile.mkstemp(prefix='.metrics-', dir=BASE_DIR)
+        try:
+            with os.fdopen(fd, 'w') as f:
+                f.writelines(json.dumps(op) + '\n' for op in operations)
+            os.replace(tmp_path, self.operations_file)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
 
-        return {'operations': [], 'summary': {'total': 0, 'success': 0, 'failed': 0, 'timeouts': 0}}
+    def _save_summary(self):
+        """Atomically save summary counters to file"""
+        fd, tmp_path = tempfile.mkstemp(prefix='.metrics-summary-', dir=BASE_DIR)
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(self._summary, f, indent=2)
+            os.replace(tmp_path, self.summary_file)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
 
-    def _save_metrics(self, metrics):
-        """Save metrics to file"""
+    def _push_operation(self, operation):
+        """Add an operation to the in-memory window, evicting the oldest if full"""
+        if len(self._ops) == self._ops.maxlen:
+            self._update_aggregates(self._ops[-1], -1)
+        self._ops.appendleft(operation)
+        self._update_aggregates(operation, 1)
+
+    def _update_aggregates(self, operation, sign):
+        """Add (sign=1) or remove (sign=-1) an operation's share of the dashboard aggregates"""
+        # Operations logged before ts_epoch was added only carry the ISO timestamp
+        if 'ts_epoch' in operation:
+            day = date.fromtimestamp(operation['ts_epoch'])
+        else:
+            day = datetime.fromisoformat(operation['timestamp']).date()
+        bucket = self._by_day.setdefault(day, [0, 0])
+        bucket[0] += sign
+        bucket[1] += sign if operation['success'] else 0
+        if not bucket[0]:
+            del self._by_day[day]
+
+        if operation.get('duration'):
+            self._duration_sum += sign * operation['duration']
+            self._duration_count += sign
+
+        code = operation['returncode']
+        if code != 0:
+            self._error_codes[code] += sign
+            if self._error_codes[code] <= 0:
+                del self._error_codes[code]
+
+    @property
+    def etag(self):
+        """ETag for the current metrics state"""
+        return f'{self._boot}-{self._version:x}'
+
+    def _append_operation(self, operation):
+        """Record an operation in memory and append it to the operations log"""
+        self._push_operation(operation)
+        self._version += 1
         try:
-            with open(self.metrics_file, 'w') as f:
-                json.dump(metrics, f, indent=2)
+            if self._fh is None:
+                self._fh = open(self.operations_file, 'a')
+            self._fh.write(json.dumps(operation) + '\n')
+            self._fh.flush()
+
+            # Compact the log down to the operations still kept in memory
+            if self._fh.tell() > METRICS_MAX_BYTES:
+                self._fh.close()
+                self._fh = None
+                self._write_operations(reversed(self._ops))
+
+            self._save_summary()
         except Exception as e:
             app.logger.error(f'Error saving metrics: {e}', exc_info=True)
 
     def record_operation(self, command, returncode, duration, dry_run=True):
         """Record an operation execution"""
-        metrics = self._load_metrics()
-
+        now = time.time()
         operation = {
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': datetime.fromtimestamp(now).isoformat(),
+            'ts_epoch': now,
             'command': command,
             'returncode': returncode,
             'duration': round(duration, 2),
@@ -486,25 +1048,21 @@ class OperationMetrics:
             'dry_run': dry_run
         }
 
-        # Add to operations list (keep last 100)
-        metrics['operations'].insert(0, operation)
-        metrics['operations'] = metrics['operations'][:100]
-
-        # Update summary
-        metrics['summary']['total'] += 1
-        if returncode == 0:
-            metrics['summary']['success'] += 1
-        else:
-            metrics['summary']['failed'] += 1
+        with self._lock:
+            self._summary['total'] += 1
+            if returncode == 0:
+                self._summary['success'] += 1
+            else:
+                self._summary['failed'] += 1
 
-        self._save_metrics(metrics)
+            self._append_operation(operation)
 
     def record_timeout(self, command):
         """Record an operation timeout"""
-        metrics = self._load_metrics()
-
+        now = time.time()
         operation = {
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': datetime.fromtimestamp(now).isoformat(),
+            'ts_epoch': now,
             'command': command,
             'returncode': -1,
             'duration': None,
@@ -512,65 +1070,61 @@ class OperationMetrics:
             'timeout': True
         }
 
-        metrics['operations'].insert(0, operation)
-        metrics['operations'] = metrics['operations'][:100]
-
-        metrics['summary']['total'] += 1
-        metrics['summary']['timeouts'] += 1
-        metrics['summary']['failed'] += 1
+        with self._lock:
+            self._summary['total'] += 1
+            self._summary['timeouts'] += 1
+            self._summary['failed'] += 1
 
-        self._save_metrics(metrics)
+            self._append_operation(operation)
 
     def get_metrics(self, limit=50):
         """Get recent metrics"""
-        metrics = self._load_metrics()
+        with self._lock:
+            operations = list(islice(self._ops, max(limit, 0)))
+            summary = dict(self._summary)
+
         return {
-            'operations': metrics['operations'][:limit],
-            'summary': metrics['summary'],
+            'operations': operations,
+            'summary': summary,
             'success_rate': round(
-                (metrics['summary']['success'] / metrics['summary']['total'] * 100)
-                if metrics['summary']['total'] > 0 else 0,
+                (summary['success'] / summary['total'] * 100)
+                if summary['total'] > 0 else 0,
                 1
             )
         }
 
     def get_dashboard_stats(self):
         """Get aggregated stats for dashboard"""
-        metrics = self._load_metrics()
-        operations = metrics['operations']
-
-        # Calculate time-based statistics
-        now = datetime.now()
-        today_ops = [op for op in operations if
-                     datetime.fromisoformat(op['timestamp']).date() == now.date()]
-        week_ops = [op for op in operations if
-                    (now - datetime.fromisoformat(op['timestamp'])).days <= 7]
-
-        # Calculate average duration (excluding timeouts)
-        durations = [op['duration'] for op in operations if op.get('duration')]
-        avg_duration = sum(durations) / len(durations) if durations else 0
-
-        # Find most common errors (non-zero return codes)
-        error_codes = {}
-        for op in operations:
-            if op['returncode'] != 0:
-                code = op['returncode']
-                error_codes[code] = error_codes.get(code, 0) + 1
+        today = datetime.now().date()
+        week_start = today - timedelta(days=7)
+
+        with self._lock:
+            summary = dict(self._summary)
+            today_total, today_success = self._by_day.get(today, (0, 0))
+            week_total = week_success = 0
+            for day, (total, success) in self._by_day.items():
+                if day >= week_start:
+                    week_total += total
+                    week_success += success
+
+            # Average duration excludes timeouts
+            avg_duration = self._duration_sum / self._duration_count if self._duration_count else 0
+            common_errors = self._error_codes.most_common(5)
 
         return {
-            'all_time': metrics['summary'],
+            'all_time': summary,
             'today': {
-                'total': len(today_ops),
-                'success': sum(1 for op in today_ops if op['success']),
-                'failed': sum(1 for op in today_ops if not op['success'])
+                'total': today_total,
+                'success': today_success,
+                'failed': today_total - today_success
             },
             'this_week': {
-                'total': len(week_ops),
-                'success': sum(1 for op in week_ops if op['success']),
-                'failed': sum(1 for op in week_ops if not op['success'])
+                'total': week_total,
+                'success': week_success,
+                'failed': week_total - week_success
             },
             'avg_duration': round(avg_duration, 2),
-            'common_errors': sorted(error_codes.items(), key=lambda x: x[1], reverse=True)[:5]
+            'common_errors': common_errors
         }
 
 # Initialize managers
@@ -578,41 +1132,53 @@ rules_manager = RulesManager(RULES_FILE)
 log_monitor = LogMonitor(LOG_FILE)
 operation_metrics = OperationMetrics()
 
+# Per-request accessors: repeated calls within one request reuse the first result
+def current_rules():
+    """Get rules for the current request"""
+    if 'rules' not in g:
+        g.rules = rules_manager.load_rules()
+    return g.rules
+
+def current_logs(lines, log_source='script'):
+    """Get (recent log lines, log stats) for the current request"""
+    cache = g.setdefault('logs', {})
+    key = (lines, log_source)
+    if key not in cache:
+        cache[key] = log_monitor.read_tail_and_stats(lines, log_source)
+    return cache[key]
+
+@lru_cache(maxsize=8)
+def _logs_json(log_source, lines, etag):
+    """Serialized /api/logs body; etag pins the cached bytes to one state of the file"""
+    logs, stats = log_monitor.read_tail_and_stats(lines, log_source)
+    return dumps_json({'logs': logs, 'stats': stats, 'source': log_source})
+
 @app.route('/')
 def index():
     """Main dashboard"""
-    rules = rules_manager.load_rules()
-    log_stats = log_monitor.get_log_stats()
-    recent_logs = log_monitor.get_recent_logs(10)
-
-    # Group rules by target
-    rules_by_target = {'SSD': [], 'NAS': [], 'Local': []}
-    for rule in rules:
-        target = rule['target'].upper()
-        if target in rules_by_target:
-            rules_by_target[target].append(rule)
+    rules_view = rules_manager.load_rules_view()
+    recent_logs, log_stats = current_logs(10)
 
     return render_template('index.html',
-                         rules_by_target=rules_by_target,
+                         rules_by_target=rules_view.by_target,
                          log_stats=log_stats,
                          recent_logs=recent_logs)
 
 @app.route('/rules')
 def rules():
     """Rules management page"""
-    rules = rules_manager.load_rules()
+    rules = current_rules()
     return render_template('rules.html', rules=rules)
 
 @app.route('/api/rules', methods=['GET', 'POST'])
 def api_rules():
     """API endpoint for rules management"""
     if request.method == 'GET':
-        rules = rules_manager.load_rules()
-        return jsonify(rules)
+        return json_response(rules_manager.load_rules_json())
 
     elif request.method == 'POST':
         try:
-            new_rules = request.json
+            new_rules = request.get_json(cache=True)
             rules_manager.save_rules(new_rules)
             flash('Rules saved successfully!', 'success')
             return jsonify({'status': 'success'})
@@ -623,7 +1189,7 @@ def api_rules():
 def api_execute():
     """Execute the music storage manager script"""
     try:
-        data = request.json
+        data = request.get_json(cache=True)
         dry_run = data.get('dry_run', True)
         verbose = data.get('verbose', False)
         only_filter = data.get('only_filter', '')
@@ -640,7 +1206,7 @@ def api_execute():
             cmd.append('--skip-nas')
 
         # Check if script exists
-        if not os.path.exists(SCRIPT_PATH):
+        if not (script_state['exists'] or refresh_script_state()['exists']):
             app.logger.error(f'Script not found: {SCRIPT_PATH}')
             return jsonify({'status': 'error', 'message': f'Script not found: {SCRIPT_PATH}'}), 404
 
@@ -648,33 +1214,46 @@ def api_execute():
         timeout = 180  # 3 minutes for all operations
 
         # Set environment variables to speed up dry runs
-        env = os.environ.copy()
-        if dry_run:
-            # Skip NAS mounting for dry runs by setting a flag
-            env['MSM_SKIP_NAS_MOUNT'] = '1'
+        env = SCRIPT_ENV_DRY_RUN if dry_run else SCRIPT_ENV
+
+        if not _execution_slots.acquire(blocking=False):
+            app.logger.warning(f'Rejected script execution: {MAX_CONCURRENT_EXECUTIONS} already running')
+            return jsonify({'status': 'error', 'message': 'Too many scripts running, try again shortly'}), 429
 
         app.logger.info(f'Executing script: {" ".join(cmd)}')
-        start_time = datetime.now()
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout, cwd=BASE_DIR, env=env)
-        duration = (datetime.now() - start_time).total_seconds()
-
-        app.logger.info(f'Script completed with return code: {result.returncode} in {duration:.2f}s')
-
-        # Record metrics
-        operation_metrics.record_operation(' '.join(cmd), result.returncode, duration, dry_run)
-
-        if result.returncode != 0:
-            app.logger.warning(f'Script exited with non-zero status: {result.returncode}')
-            if result.stderr:
-                app.logger.warning(f'Script stderr: {result.stderr}')
-
-            # Send alert for script failures (non-dry-run only)
-            if not dry_run:
-                send_error_alert(
-                    'Script Execution Failed',
-                    f'Music storage manager script failed with exit code {result.returncode}',
-                    result.stderr[:500] if result.stderr else 'No error output'
-                )
+        if data.get('stream'):
+            # Start the script before any headers go out, so a script that
+            # can't be launched still gets the JSON error response below
+            try:
+                proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                        cwd=BASE_DIR, env=env)
+            except BaseException:
+                _execution_slots.release()
+                raise
+
+            def close():
+                # Runs once the response is done, including when the client
+                # disconnects before reading any of the body
+                if proc.poll() is None:
+                    proc.kill()
+                proc.wait()
+                proc.stdout.close()
+                _execution_slots.release()
+
+            # Output goes to the client as it is produced
+            response = app.response_class(stream_script(proc, cmd, timeout, dry_run),
+                                          mimetype='text/plain')
+            response.call_on_close(close)
+            return response
+
+        start_time = time.monotonic()
+        try:
+            result = run_script(cmd, timeout, env)
+        finally:
+            _execution_slots.release()
+        duration = time.monotonic() - start_time
+
+        record_script_result(cmd, result.returncode, duration, dry_run, result.stderr)
 
         return jsonify({
             'status': 'success',
@@ -686,16 +1265,7 @@ def api_execute():
         })
 
     except subprocess.TimeoutExpired:
-        app.logger.error(f'Script execution timed out after {timeout}s')
-
-        # Record timeout in metrics
-        operation_metrics.record_timeout(' '.join(cmd))
-
-        send_error_alert(
-            'Script Timeout',
-            f'Music storage manager script timed out after {timeout} seconds',
-            f'Command: {" ".join(cmd)}'
-        )
+        record_script_timeout(cmd, timeout)
         return jsonify({'status': 'error', 'message': 'Operation timed out'}), 408
     except Exception as e:
         app.logger.error(f'Script execution error: {e}', exc_info=True)
@@ -706,12 +1276,90 @@ def api_execute():
         )
         return jsonify({'status': 'error', 'message': str(e)}), 500
 
+def record_script_result(cmd, returncode, duration, dry_run, error_output):
+    """Log, record metrics and alert for a finished script run"""
+    app.logger.info(f'Script completed with return code: {returncode} in {duration:.2f}s')
+
+    # Record metrics
+    operation_metrics.record_operation(' '.join(cmd), returncode, duration, dry_run)
+
+    if returncode != 0:
+        app.logger.warning(f'Script exited with non-zero status: {returncode}')
+        if error_output:
+            app.logger.warning(f'Script stderr: {error_output}')
+
+        # Send alert for script failures (non-dry-run only)
+        if not dry_run:
+            send_error_alert(
+                'Script Execution Failed',
+                f'Music storage manager script failed with exit code {returncode}',
+                error_output[:500] if error_output else 'No error output'
+            )
+
+def record_script_timeout(cmd, timeout):
+    """Log, record metrics and alert for a script run that timed out"""
+    app.logger.error(f'Script execution timed out after {timeout}s')
+
+    # Record timeout in metrics
+    operation_metrics.record_timeout(' '.join(cmd))
+
+    send_error_alert(
+        'Script Timeout',
+        f'Music storage manager script timed out after {timeout} seconds',
+        f'Command: {" ".join(cmd)}'
+    )
+
+def stream_script(proc, cmd, timeout, dry_run):
+    """Yield a started process's combined stdout/stderr as it is produced, then a status line.
+
+    proc must have been started with stdout=PIPE and stderr=STDOUT.
+    Metrics and alerts are recorded as for the buffered path. The process
+    is killed on timeout, or if the client stops reading mid-stream.
+    """
+    start_time = time.monotonic()
+    deadline = start_time + timeout
+    tail = b''  # last bytes of output, for failure logs and alerts
+
+    yield f'Command: {" ".join(cmd)}\n\n'.encode('utf-8')
+
+    with proc:
+        try:
+            with selectors.DefaultSelector() as selector:
+                selector.register(proc.stdout, selectors.EVENT_READ)
+                while True:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise subprocess.TimeoutExpired(cmd, timeout)
+                    if not selector.select(remaining):
+                        continue
+
+                    chunk = os.read(proc.stdout.fileno(), 65536)
+                    if not chunk:
+                        break
+                    tail = (tail + chunk)[-500:]
+                    yield chunk
+
+            returncode = proc.wait(timeout=max(deadline - time.monotonic(), 0))
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            record_script_timeout(cmd, timeout)
+            yield f'\n[Operation timed out after {timeout}s]\n'.encode('utf-8')
+            return
+        finally:
+            # Also reached when the client disconnects; don't leave the script running
+            if proc.poll() is None:
+                proc.kill()
+
+    duration = time.monotonic() - start_time
+    record_script_result(cmd, returncode, duration, dry_run,
+                         tail.decode('utf-8', errors='replace') if returncode else '')
+    yield f'\n[Exit code {returncode} after {duration:.2f}s]\n'.encode('utf-8')
+
 @app.route('/logs')
 def logs():
     """Log viewing page"""
     lines = request.args.get('lines', 100, type=int)
-    recent_logs = log_monitor.get_recent_logs(lines)
-    log_stats = log_monitor.get_log_stats()
+    recent_logs, log_stats = current_logs(lines)
 
     return render_template('logs.html',
                          logs=recent_logs,
@@ -723,10 +1371,9 @@ def api_logs():
     """API endpoint for log data"""
     lines = request.args.get('lines', 50, type=int)
     log_source = request.args.get('source', 'script', type=str)
-    logs = log_monitor.get_recent_logs(lines, log_source)
-    stats = log_monitor.get_log_stats(log_source)
-
-    return jsonify({'logs': logs, 'stats': stats, 'source': log_source})
+    # Tag before reading so a write in between only causes a spare refetch
+    etag = log_monitor.etag(log_source)
+    return conditional_json(etag, lambda: _logs_json(log_source, lines, etag))
 
 @app.route('/api/logs/sources')
 def api_log_sources():
@@ -746,7 +1393,7 @@ def api_log_rotation():
 def api_metrics():
     """Get operation metrics"""
     limit = request.args.get('limit', 50, type=int)
-    return jsonify(operation_metrics.get_metrics(limit))
+    return conditional_json(operation_metrics.etag, lambda: dumps_json(operation_metrics.get_metrics(limit)))
 
 @app.route('/api/metrics/dashboard')
 def api_metrics_dashboard():
@@ -758,70 +1405,12 @@ def api_metrics_dashboard():
 def health():
     """Health check endpoint for monitoring"""
     try:
-        health_status = {
-            'status': 'healthy',
-            'timestamp': datetime.now().isoformat(),
-            'checks': {}
-        }
-
-        # Check script accessibility
-        script_exists = os.path.exists(SCRIPT_PATH)
-        script_executable = os.access(SCRIPT_PATH, os.X_OK) if script_exists else False
-        health_status['checks']['script'] = {
-            'exists': script_exists,
-            'executable': script_executable,
-            'path': SCRIPT_PATH,
-            'healthy': script_exists and script_executable
-        }
-
-        # Check SSD mount
-        ssd_mounted = os.path.exists(SSD_ROOT) and os.path.ismount(SSD_ROOT)
-        health_status['checks']['ssd'] = {
-            'path': SSD_ROOT,
-            'mounted': ssd_mounted,
-            'exists': os.path.exists(SSD_ROOT),
-            'healthy': os.path.exists(SSD_ROOT)
-        }
-
-        # Check NAS mount (optional)
-        nas_mounted = os.path.exists(NAS_ROOT) and os.path.ismount(NAS_ROOT)
-        health_status['checks']['nas'] = {
-            'path': NAS_ROOT,
-            'mounted': nas_mounted,
-            'exists': os.path.exists(NAS_ROOT),
-            'healthy': True,  # NAS is optional
-            'optional': True
-        }
-
-        # Check log files writability
-        log_writable = os.access(os.path.dirname(LOG_FILE), os.W_OK)
-        app_log_writable = os.access(os.path.dirname(APP_LOG_FILE), os.W_OK)
-        health_status['checks']['logging'] = {
-            'script_log_writable': log_writable,
-            'app_log_writable': app_log_writable,
-            'healthy': log_writable and app_log_writable
-        }
-
-        # Check rules file
-        rules_readable = os.path.exists(RULES_FILE) and os.access(RULES_FILE, os.R_OK)
-        health_status['checks']['rules'] = {
-            'exists': os.path.exists(RULES_FILE),
-            'readable': rules_readable,
-            'path': RULES_FILE,
-            'healthy': rules_readable
-        }
-
-        # Overall health
-        all_critical_healthy = (
-            health_status['checks']['script']['healthy'] and
-            health_status['checks']['logging']['healthy'] and
-            health_status['checks']['rules']['healthy']
-        )
-
-        health_status['status'] = 'healthy' if all_critical_healthy else 'degraded'
-
-        status_code = 200 if all_critical_healthy else 503
-        return jsonify(health_status), status_code
+        with _health_lock:
+            now = time.monotonic()
+            if _health_cache['value'] is None or now - _health_cache['ts'] >= HEALTH_CACHE_SECONDS:
+                _health_cache['value'], _health_cache['status'] = _check_health()
+                _health_cache['ts'] = now
+            return jsonify(_health_cache['value']), _health_cache['status']
 
     except Exception as e:
         app.logger.error(f'Health check error: {e}', exc_info=True)
@@ -831,54 +1420,160 @@ def health():
             'timestamp': datetime.now().isoformat()
         }), 500
 
+def _check_health():
+    """Probe the filesystem and return (health status, HTTP status code)"""
+    health_status = {
+        'status': 'healthy',
+        'timestamp': datetime.now().isoformat(),
+        'checks': {}
+    }
+
+    # Check script accessibility
+    script_exists = os.path.exists(SCRIPT_PATH)
+    script_executable = os.access(SCRIPT_PATH, os.X_OK) if script_exists else False
+    health_status['checks']['script'] = {
+        'exists': script_exists,
+        'executable': script_executable,
+        'path': SCRIPT_PATH,
+        'healthy': script_exists and script_executable
+    }
+
+    # Check SSD mount (the exists guard skips the ismount call for a missing path)
+    ssd_exists = os.path.exists(SSD_ROOT)
+    health_status['checks']['ssd'] = {
+        'path': SSD_ROOT,
+        'mounted': ssd_exists and os.path.ismount(SSD_ROOT),
+        'exists': ssd_exists,
+        'healthy': ssd_exists
+    }
+
+    # Check NAS mount (optional)
+    nas_exists = os.path.exists(NAS_ROOT)
+    health_status['checks']['nas'] = {
+        'path': NAS_ROOT,
+        'mounted': nas_exists and os.path.ismount(NAS_ROOT),
+        'exists': nas_exists,
+        'healthy': True,  # NAS is optional
+        'optional': True
+    }
+
+    # Check log files writability
+    log_writable = os.access(os.path.dirname(LOG_FILE), os.W_OK)
+    app_log_writable = os.access(os.path.dirname(APP_LOG_FILE), os.W_OK)
+    health_status['checks']['logging'] = {
+        'script_log_writable': log_writable,
+        'app_log_writable': app_log_writable,
+        'healthy': log_writable and app_log_writable
+    }
+
+    # Check rules file
+    rules_exists = os.path.exists(RULES_FILE)
+    rules_readable = rules_exists and os.access(RULES_FILE, os.R_OK)
+    health_status['checks']['rules'] = {
+        'exists': rules_exists,
+        'readable': rules_readable,
+        'path': RULES_FILE,
+        'healthy': rules_readable
+    }
+
+    # Overall health
+    all_critical_healthy = (
+        health_status['checks']['script']['healthy'] and
+        health_status['checks']['logging']['healthy'] and
+        health_status['checks']['rules']['healthy']
+    )
+
+    health_status['status'] = 'healthy' if all_critical_healthy else 'degraded'
+
+    status_code = 200 if all_critical_healthy else 503
+    return health_status, status_code
+
+def script_help_result():
+    """Run the script with --help, at most once per version of the script file"""
+    try:
+        st = os.stat(SCRIPT_PATH)
+        # ctime also moves on chmod, so permission fixes are picked up too
+        key = (SCRIPT_PATH, st.st_ino, st.st_mtime_ns, st.st_ctime_ns)
+    except OSError as e:
+        return {'returncode': None, 'stdout': None, 'stderr': None, 'error': str(e)}
+
+    with _help_lock:
+        if _help_cache['key'] == key:
+            return _help_cache['result']
+
+        try:
+            completed = subprocess.run([SCRIPT_PATH, '--help'],
+                                       capture_output=True, text=True, timeout=10, cwd=BASE_DIR)
+        except Exception as e:
+            # Failures to run at all aren't cached; the next call tries again
+            return {'returncode': None, 'stdout': None, 'stderr': None, 'error': str(e)}
+
+        result = {
+            'returncode': completed.returncode,
+            'stdout': completed.stdout,
+            'stderr': completed.stderr,
+            'error': None
+        }
+        _help_cache['key'], _help_cache['result'] = key, result
+        return result
+
 @app.route('/api/test')
 def api_test():
     """Test endpoint to verify script accessibility"""
     try:
         # Test if script exists and is executable
-        script_exists = os.path.exists(SCRIPT_PATH)
-        script_executable = os.access(SCRIPT_PATH, os.X_OK) if script_exists else False
+        state = script_state if script_state['executable'] else refresh_script_state()
+        script_exists = state['exists']
+        script_executable = state['executable']
 
         # Test basic command
-        test_result = None
-        if script_executable:
-            try:
-                test_result = subprocess.run([SCRIPT_PATH, '--help'],
-                                           capture_output=True, text=True, timeout=10, cwd=BASE_DIR)
-            except Exception as e:
-                test_result = {'error': str(e)}
+        test_result = script_help_result() if script_executable else None
 
         return jsonify({
             'script_path': SCRIPT_PATH,
             'script_exists': script_exists,
             'script_executable': script_executable,
             'cwd': BASE_DIR,
-            'test_result': {
-                'returncode': getattr(test_result, 'returncode', None),
-                'stdout': getattr(test_result, 'stdout', None),
-                'stderr': getattr(test_result, 'stderr', None),
-                'error': test_result.get('error') if isinstance(test_result, dict) else None
-            } if test_result else None
+            'test_result': test_result
         })
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/refresh-script-state', methods=['POST'])
+def api_refresh_script_state():
+    """Re-check the script after its permissions or location were fixed"""
+    state = refresh_script_state()
+    app.logger.info(f'Script state refreshed: {state}')
+    return jsonify({'script_path': SCRIPT_PATH, **state})
+
+@app.route('/api/backup/<name>')
+def api_download_backup(name):
+    """Download a script log backup created by clearing the logs"""
+    path = os.path.join(os.path.dirname(LOG_FILE) or '.', name)
+    if not name.startswith(os.path.basename(LOG_BACKUP_PREFIX)) or not os.path.isfile(path):
+        return jsonify({'status': 'error', 'message': f'Backup not found: {name}'}), 404
+
+    # send_file streams from disk (sendfile where the server supports it)
+    # and honours If-Modified-Since / Range requests
+    return send_file(path, as_attachment=True, conditional=True)
+
 @app.route('/api/clear-logs', methods=['POST'])
 def api_clear_logs():
     """Clear the log file and keep only last 5 backups"""
     try:
         if os.path.exists(LOG_FILE):
             # Create backup before clearing
-            backup_file = f"{LOG_FILE}.backup.{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-            os.rename(LOG_FILE, backup_file)
+            backup_file = LOG_BACKUP_PREFIX + time.strftime('%Y%m%d_%H%M%S')
+            shutil.copy2(LOG_FILE, backup_file)
             app.logger.info(f'Created log backup before clearing: {backup_file}')
 
         # Clean up old backups - keep only last 5
         cleanup_old_backups()
 
-        # Create new empty log file
+        # Truncate in place (same inode) so processes holding the log open keep working
         with open(LOG_FILE, 'w') as f:
-            f.write(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Log file cleared\n")
+            f.write(f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] Log file cleared\n")
+        log_monitor.reset_stats(LOG_FILE)
 
         app.logger.info('Log file cleared successfully')
         return jsonify({
@@ -894,17 +1589,14 @@ def api_clear_logs():
 
 def cleanup_old_backups():
     """Keep only the last 5 log backup files"""
-    import glob
-
-    # Find all backup files
-    backup_pattern = f"{LOG_FILE}.backup.*"
-    backup_files = glob.glob(backup_pattern)
+    # Find all backup files in one directory scan
+    entries = LogMonitor._list_backups(LOG_FILE, '.backup.')
 
-    # Sort by modification time (newest first)
-    backup_files.sort(key=lambda x: os.path.getmtime(x), reverse=True)
+    # Sort by modification time (newest first); DirEntry caches its stat
+    entries.sort(key=lambda e: e.stat().st_mtime, reverse=True)
 
     # Remove files beyond the first 5
-    files_to_remove = backup_files[5:]
+    files_to_remove = [e.path for e in entries[5:]]
 
     for file_path in files_to_remove:
         try:
@@ -4,13 +4,12 @@ Music Storage Manager Desktop App
 A desktop wrapper for the Flask web interface using PyWebView.
 """
 
-import webview
+import socket
 import threading
 import time
 import sys
 import os
 import logging
-from app import app
 
 # Get logger for desktop app
 logger = logging.getLogger('desktop_app')
@@ -23,6 +22,8 @@ class DesktopApp:
     def start_flask(self):
         """Start Flask server in background thread"""
         try:
+            from app import app
+
             # Disable Flask's reloader in desktop mode
             app.run(host='127.0.0.1', port=5001, debug=False, use_reloader=False)
         except Exception as e:
@@ -33,13 +34,24 @@ class DesktopApp:
         import requests
         start_time = time.time()
 
-        while time.time() - start_time < timeout:
-            try:
-                response = requests.get('http://127.0.0.1:5001', timeout=1)
-                if response.status_code == 200:
-                    self.server_started = True
-                    return True
-            except:
+        # A bare TCP connect is enough to see the port come up; only then
+        # ask Flask for a page, so startup doesn't render the dashboard repeatedly
+        with requests.Session() as session:
+            while time.time() - start_time < timeout:
+                try:
+                    with socket.create_connection(('127.0.0.1', 5001), timeout=0.2):
+                        pass
+                except OSError:
+                    time.sleep(0.1)
+                    continue
+
+                try:
+                    response = session.head('http://127.0.0.1:5001', timeout=1)
+                    if response.status_code == 200:
+                        self.server_started = True
+                        return True
+                except requests.RequestException:
+                    pass
                 time.sleep(0.5)
 
         return False
@@ -60,6 +72,9 @@ class DesktopApp:
         self.flask_thread = threading.Thread(target=self.start_flask, daemon=True)
         self.flask_thread.start()
 
+        # PyWebView pulls in the native GUI bindings; load them while Flask starts
+        import webview
+
         # Wait for server to start
         logger.info("Starting Music Storage Manager...")
         if not self.wait_for_server():
@@ -102,6 +117,9 @@ class DesktopApp:
 
 def main():
     """Main entry point"""
+    # Importing the app also configures logging for the messages below
+    from app import app
+
     if len(sys.argv) > 1 and sys.argv[1] == '--web':
         # Run in web mode (original Flask app)
         logger.info("Starting in web mode...")
@@ -7,7 +7,6 @@ Simple script to start the Flask web application.
 import os
 import sys
 import logging
-import webbrowser
 from threading import Timer
 
 # Configure basic logging before importing app
@@ -19,6 +18,7 @@ logger = logging.getLogger(__name__)
 
 def open_browser():
     """Open web browser after a short delay"""
+    import webbrowser
     webbrowser.open('http://127.0.0.1:5000')
 
 if __name__ == '__main__':
@@ -34,6 +34,7 @@ if __name__ == '__main__':
     # Open browser after 1.5 seconds
     def open_browser_new():
         try:
+            import webbrowser
             webbrowser.open('http://127.0.0.1:5001')
             logger.info("Opened web browser")
         except Exception as e: